@@ -1,18 +1,29 @@
 import os
-import json
+import sys
 import asyncio
+import functools
+import math
 import logging
 import re
+import ssl
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional, Dict, List, Set
+from typing import Optional, Dict, FrozenSet, Iterable, Iterator, List, Set, Tuple
 from pathlib import Path
+from urllib.parse import quote
 
+import ahocorasick
 import aiohttp
+import orjson
 from aiogram import Bot, Dispatcher, types, F
 from aiogram.filters import Command
 from aiogram.types import Message
 from aiogram.enums import ParseMode
+from aiogram.exceptions import TelegramForbiddenError, TelegramRetryAfter
 from aiogram.client.default import DefaultBotProperties
+from aiogram.client.session.aiohttp import AiohttpSession
 from dotenv import load_dotenv
 
 env_path = Path(__file__).parent / '.env'
@@ -24,28 +35,121 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Optional chat the bot posts each notification to once, then copies it to subscribers from there
+LOG_CHAT_ID = os.getenv('LOG_CHAT_ID')
+
 POLYMARKET_API = "https://gamma-api.polymarket.com"
+MARKET_CONTEXT_URL = "https://polymarket.com/api/grok/event-summary?prompt={}"
+MARKET_CONTEXT_HEADERS = {
+    'Content-Type': 'application/json',
+    'Accept': '*/*',
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
 USERS_FILE = "users.json"
 SEEN_EVENTS_FILE = "seen_events.json"
+SEEN_EVENTS_LOG = "seen_events.log"  # IDs seen since the last seen_events.json snapshot
 KEYWORDS_FILE = "keywords.json"
 PAUSED_USERS_FILE = "paused_users.json"
-CHECK_INTERVAL = 60  # Check every 60 seconds (1 minute)
+CHECK_INTERVAL = 60  # Check every 60 seconds (1 minute) by default
+MIN_CHECK_INTERVAL = CHECK_INTERVAL / 4  # Poll faster while new events keep arriving
+MAX_CHECK_INTERVAL = CHECK_INTERVAL * 4  # Poll slower while the feed is quiet
+KEEPALIVE_TIMEOUT = 75  # Keep idle HTTP connections longer than CHECK_INTERVAL so polls reuse them
+POLL_LIMIT = 20  # Events fetched per poll at CHECK_INTERVAL, scaled up for longer intervals
+STARTUP_PAGE_SIZE = 20  # Startup fetches are split into pages of this size...
+STARTUP_PAGE_CONCURRENCY = 5  # ...with at most this many requests in flight
+FLUSH_DELAY = 0.25  # Let a burst of storage changes coalesce before writing
+SEEN_EVENTS_LIMIT = 50000  # Remember only the most recent event IDs (a few MB at most)
+SEND_RATE_LIMIT = 28  # Notifications per second (Telegram allows ~30 msg/s)
+SEND_RETRIES = 2  # Resend a notification this many times after a 429 (command replies share the limit)
+MESSAGE_LIMIT = 4000  # Stay under Telegram's 4096 character cap per message
+
+EVENT_URL_PATTERN = re.compile(r'polymarket\.com/event/([a-zA-Z0-9\-]+)')
+# Argument of a command like "/deal <link>" or "/deal@BotName <link>", without surrounding whitespace
+COMMAND_ARG_PATTERN = re.compile(r'^/\w+(?:@\w+)?\s+(\S.*?)\s*$', re.DOTALL)
+
+# SSL context that doesn't verify certificates (fixes Windows SSL issues).
+# Built once at import: create_default_context() loads the CA bundle from disk.
+SSL_CONTEXT = ssl.create_default_context()
+SSL_CONTEXT.check_hostname = False
+SSL_CONTEXT.verify_mode = ssl.CERT_NONE
+
+
+class LRUSet:
+    """Set that keeps insertion order and forgets the oldest items beyond maxsize"""
+
+    def __init__(self, items: Iterable[str] = (), maxsize: int = SEEN_EVENTS_LIMIT):
+        self.maxsize = maxsize
+        self._items: OrderedDict = OrderedDict()
+        for item in items:
+            self.add(item)
+
+    def add(self, item: str):
+        self._items[item] = None
+        self._items.move_to_end(item)
+        if len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+    def __contains__(self, item) -> bool:
+        return item in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._items)
+
+
+class RateLimiter:
+    """Token bucket that lets through at most `rate` acquisitions per second"""
+
+    def __init__(self, rate: float, capacity: float = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        # Waiters queue on the lock, so tokens are handed out in arrival order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
 
 subscribed_users: Set[int] = set()
-seen_events: Set[str] = set()
+seen_events: LRUSet = LRUSet()
 user_keywords: Dict[int, List[str]] = {}
+compiled_keywords: Dict[int, ahocorasick.Automaton] = {}
 paused_users: Set[int] = set()
+# Active (subscribed, not paused) users split by whether events must be matched against their keywords
+unfiltered_users: Set[int] = set()
+filtered_users: Set[int] = set()
 
 
 class Storage:
 
+    @staticmethod
+    def write_json(path: str, payload):
+        """Serialize payload in one buffered write and atomically replace the file"""
+        # Integer user IDs are valid keys for the keywords store
+        data = orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
     @staticmethod
     def load_users() -> Set[int]:
         if Path(USERS_FILE).exists():
             try:
-                with open(USERS_FILE, 'r') as f:
-                    data = json.load(f)
-                    return set(data.get('users', []))
+                data = orjson.loads(Path(USERS_FILE).read_bytes())
+                return set(data.get('users', []))
             except Exception as e:
                 logger.error(f"Error loading users: {e}")
         return set()
@@ -53,39 +157,61 @@ class Storage:
     @staticmethod
     def save_users(users: Set[int]):
         try:
-            with open(USERS_FILE, 'w') as f:
-                json.dump({'users': list(users)}, f, indent=2)
+            Storage.write_json(USERS_FILE, {'users': list(users)})
             logger.info(f"Saved {len(users)} users")
         except Exception as e:
             logger.error(f"Error saving users: {e}")
 
     @staticmethod
-    def load_seen_events() -> Set[str]:
+    def load_seen_events() -> LRUSet:
         if Path(SEEN_EVENTS_FILE).exists():
             try:
-                with open(SEEN_EVENTS_FILE, 'r') as f:
-                    data = json.load(f)
-                    return set(data.get('events', []))
+                data = orjson.loads(Path(SEEN_EVENTS_FILE).read_bytes())
+                # Saved oldest first, so the newest IDs survive the cap
+                events = LRUSet(data.get('events', []))
             except Exception as e:
                 logger.error(f"Error loading events: {e}")
-        return set()
+                events = LRUSet()
+        else:
+            events = LRUSet()
+
+        # Replay IDs appended after the snapshot was written
+        if Path(SEEN_EVENTS_LOG).exists():
+            try:
+                with open(SEEN_EVENTS_LOG, 'r') as f:
+                    for line in f:
+                        event_id = line.strip()
+                        if event_id:
+                            events.add(event_id)
+            except Exception as e:
+                logger.error(f"Error loading events log: {e}")
+        return events
 
     @staticmethod
-    def save_seen_events(events: Set[str]):
+    def save_seen_events(events: Iterable[str]):
+        """Write a full snapshot and drop the log it supersedes"""
         try:
-            with open(SEEN_EVENTS_FILE, 'w') as f:
-                json.dump({'events': list(events)}, f, indent=2)
+            Storage.write_json(SEEN_EVENTS_FILE, {'events': list(events)})
+            if Path(SEEN_EVENTS_LOG).exists():
+                os.remove(SEEN_EVENTS_LOG)
         except Exception as e:
             logger.error(f"Error saving events: {e}")
 
+    @staticmethod
+    def append_seen_events(event_ids: List[str]):
+        try:
+            with open(SEEN_EVENTS_LOG, 'a') as f:
+                f.write(''.join(f"{event_id}\n" for event_id in event_ids))
+        except Exception as e:
+            logger.error(f"Error appending events: {e}")
+
     @staticmethod
     def load_keywords() -> Dict[int, List[str]]:
         if Path(KEYWORDS_FILE).exists():
             try:
-                with open(KEYWORDS_FILE, 'r') as f:
-                    data = json.load(f)
-                    # Convert string keys back to integers
-                    return {int(k): v for k, v in data.items()}
+                data = orjson.loads(Path(KEYWORDS_FILE).read_bytes())
+                # Convert string keys back to integers
+                return {int(k): v for k, v in data.items()}
             except Exception as e:
                 logger.error(f"Error loading keywords: {e}")
         return {}
@@ -93,8 +219,7 @@ class Storage:
     @staticmethod
     def save_keywords(keywords: Dict[int, List[str]]):
         try:
-            with open(KEYWORDS_FILE, 'w') as f:
-                json.dump(keywords, f, indent=2)
+            Storage.write_json(KEYWORDS_FILE, keywords)
             logger.info(f"Saved keywords for {len(keywords)} users")
         except Exception as e:
             logger.error(f"Error saving keywords: {e}")
@@ -103,9 +228,8 @@ class Storage:
     def load_paused_users() -> Set[int]:
         if Path(PAUSED_USERS_FILE).exists():
             try:
-                with open(PAUSED_USERS_FILE, 'r') as f:
-                    data = json.load(f)
-                    return set(data.get('users', []))
+                data = orjson.loads(Path(PAUSED_USERS_FILE).read_bytes())
+                return set(data.get('users', []))
             except Exception as e:
                 logger.error(f"Error loading paused users: {e}")
         return set()
@@ -113,19 +237,145 @@ class Storage:
     @staticmethod
     def save_paused_users(users: Set[int]):
         try:
-            with open(PAUSED_USERS_FILE, 'w') as f:
-                json.dump({'users': list(users)}, f, indent=2)
+            Storage.write_json(PAUSED_USERS_FILE, {'users': list(users)})
             logger.info(f"Saved {len(users)} paused users")
         except Exception as e:
             logger.error(f"Error saving paused users: {e}")
 
 
+class StorageFlusher:
+    """
+    Coalesces Storage writes and runs them off the event loop.
+    Handlers mark stores dirty; run() writes each one once per burst of changes.
+    A single writer thread keeps writes to the same file in submission order.
+    """
+
+    def __init__(self):
+        self.dirty: Set[str] = set()
+        self.event = asyncio.Event()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='storage')
+
+    def mark(self, store: str):
+        self.dirty.add(store)
+        self.event.set()
+
+    def submit(self, func, *args) -> asyncio.Future:
+        return asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def flush(self):
+        dirty, self.dirty = self.dirty, set()
+        self.event.clear()
+
+        # Snapshot on the loop thread so handlers can keep mutating while the writer runs
+        writes = []
+        if 'users' in dirty:
+            writes.append(self.submit(Storage.save_users, set(subscribed_users)))
+        if 'seen_events' in dirty:
+            writes.append(self.submit(Storage.save_seen_events, list(seen_events)))
+        if 'keywords' in dirty:
+            writes.append(self.submit(Storage.save_keywords, dict(user_keywords)))
+        if 'paused_users' in dirty:
+            writes.append(self.submit(Storage.save_paused_users, set(paused_users)))
+
+        if writes:
+            # Shielded: the stores are no longer marked dirty, so a cancelled write would be lost
+            await asyncio.shield(asyncio.gather(*writes))
+
+    async def run(self):
+        while True:
+            await self.event.wait()
+            await asyncio.sleep(FLUSH_DELAY)
+            await self.flush()
+
+    async def close(self):
+        """Write whatever is still dirty and wait for every queued write before shutting the writer down"""
+        await self.flush()
+        # Jobs run in submission order, so this no-op finishes after any pending log append
+        await self.submit(lambda: None)
+        self._executor.shutdown()
+
+
 class PolymarketAPI:
 
+    _session: Optional[aiohttp.ClientSession] = None
+
+    @classmethod
+    def get_session(cls) -> aiohttp.ClientSession:
+        """
+        Return the shared HTTP session, creating it on first use.
+        Keeping one session alive lets requests reuse pooled keep-alive
+        connections instead of paying a TCP+TLS handshake every time.
+        """
+        if cls._session is None or cls._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=100,
+                limit_per_host=20,
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+                ssl=SSL_CONTEXT
+            )
+            cls._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=120),
+                connector=connector
+            )
+        return cls._session
+
+    @classmethod
+    async def close_session(cls):
+        if cls._session is not None and not cls._session.closed:
+            await cls._session.close()
+        cls._session = None
+
+    @staticmethod
+    def compile_keywords(keywords: List[str]) -> ahocorasick.Automaton:
+        """
+        Compile a user's keyword list into an Aho-Corasick automaton once,
+        so matching an event is a single pass over its text for any number of keywords.
+        Phrase quotes are removed and everything is lowercased.
+        Users with the same keywords share one automaton.
+        """
+        normalized = set()
+        for keyword in keywords:
+            keyword = keyword.strip()
+            if not keyword:
+                continue
+
+            # Phrase matching - remove quotes
+            if (keyword.startswith('"') and keyword.endswith('"')) or \
+               (keyword.startswith("'") and keyword.endswith("'")):
+                keyword = keyword[1:-1]
+
+            keyword = keyword.lower()
+            if keyword:
+                normalized.add(keyword)
+
+        return PolymarketAPI._compile_keyword_set(frozenset(normalized))
+
     @staticmethod
-    def matches_keywords(event_data: Dict, keywords: List[str]) -> bool:
+    @functools.lru_cache(maxsize=4096)
+    def _compile_keyword_set(keywords: FrozenSet[str]) -> ahocorasick.Automaton:
+        automaton = ahocorasick.Automaton()
+        for keyword in keywords:
+            automaton.add_word(keyword, keyword)
+        automaton.make_automaton()
+        return automaton
+
+    @staticmethod
+    def build_searchable(event_data: Dict) -> str:
+        """Lowercased event title and market questions, built once per event for keyword matching"""
+        title = event_data.get('title', '').lower()
+
+        # Also check market questions
+        markets = event_data.get('markets', [])
+        market_text = ' '.join([m.get('question', '').lower() for m in markets])
+
+        # Combined searchable text
+        return f"{title} {market_text}"
+
+    @staticmethod
+    def matches_keywords(searchable: str, keywords: ahocorasick.Automaton) -> bool:
         """
         Check if event matches any of the user's keywords.
+        Expects text from build_searchable and keywords prepared by compile_keywords.
         Supports:
         - Simple word matching (case-insensitive)
         - Phrase matching with quotes
@@ -138,34 +388,8 @@ class PolymarketAPI:
         if not keywords:
             return True  # No filters = show all events
 
-        title = event_data.get('title', '').lower()
-
-        # Also check market questions
-        markets = event_data.get('markets', [])
-        market_text = ' '.join([m.get('question', '').lower() for m in markets])
-
-        # Combined searchable text
-        searchable = f"{title} {market_text}"
-
-        # Check each keyword (OR logic)
-        for keyword in keywords:
-            keyword = keyword.strip()
-            if not keyword:
-                continue
-
-            # Check if it's a phrase (has quotes)
-            if (keyword.startswith('"') and keyword.endswith('"')) or \
-               (keyword.startswith("'") and keyword.endswith("'")):
-                # Phrase matching - remove quotes
-                phrase = keyword[1:-1].lower()
-                if phrase in searchable:
-                    return True
-            else:
-                # Simple word matching
-                if keyword.lower() in searchable:
-                    return True
-
-        return False
+        # Any keyword found (OR logic)
+        return next(keywords.iter(searchable), None) is not None
 
     @staticmethod
     async def fetch_market_context(event_slug: str, market_question: str = None, retry: int = 0) -> Optional[str]:
@@ -179,60 +403,41 @@ class PolymarketAPI:
             return None
 
         # The API only accepts event slugs, not market questions
-        url = f"https://polymarket.com/api/grok/event-summary?prompt={event_slug}"
-
-        # Create a timeout object with 120 seconds total timeout
-        timeout = aiohttp.ClientTimeout(total=120)
-
-        # Create SSL context that doesn't verify certificates (fixes Windows SSL issues)
-        import ssl
-        ssl_context = ssl.create_default_context()
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
+        url = MARKET_CONTEXT_URL.format(quote(event_slug, safe=''))
 
         try:
-            connector = aiohttp.TCPConnector(ssl=ssl_context)
-            async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
-                logger.info(f"Fetching Market Context for: {event_slug} (attempt {retry + 1}/2)")
-                async with session.post(
-                    url,
-                    headers={
-                        'Content-Type': 'application/json',
-                        'Accept': '*/*',
-                        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                    }
-                ) as response:
-                    logger.info(f"Market Context API status: {response.status}")
-                    if response.status == 200:
-                        text = await response.text()
-                        logger.info(f"Received response of length: {len(text)} chars")
-                        if text and len(text) > 50:
-                            # Remove sources block if present
-                            if '__SOURCES__' in text:
-                                text = text.split('__SOURCES__')[0].strip()
-                            logger.info(f"✓ Got Market Context (length: {len(text)} chars)")
-                            return text
-                        else:
-                            logger.warning(f"Market Context response too short: {len(text)} chars")
-                            logger.warning(f"Response: {text}")
-                            # Retry if response is too short and we haven't retried yet
-                            if retry < 1 and len(text) < 50:
-                                logger.info("Retrying due to short response...")
-                                await asyncio.sleep(2)
-                                return await PolymarketAPI.fetch_market_context(event_slug, market_question, retry + 1)
-                    elif response.status == 400:
-                        logger.error(f"Bad Request (400) - Invalid event slug: {event_slug}")
-                        error_text = await response.text()
-                        logger.error(f"Error response: {error_text}")
+            # Shared session uses a 120 seconds total timeout
+            session = PolymarketAPI.get_session()
+            logger.info(f"Fetching Market Context for: {event_slug} (attempt {retry + 1}/2)")
+            async with session.post(url, headers=MARKET_CONTEXT_HEADERS) as response:
+                logger.info(f"Market Context API status: {response.status}")
+                if response.status == 200:
+                    text = await PolymarketAPI.read_market_context(response)
+                    logger.info(f"Received response of length: {len(text)} chars")
+                    if text and len(text) > 50:
+                        logger.info(f"✓ Got Market Context (length: {len(text)} chars)")
+                        return text
                     else:
-                        logger.warning(f"Market Context API returned status: {response.status}")
-                        error_text = await response.text()
-                        logger.warning(f"Error response: {error_text}")
-                        # Retry on 5xx errors
-                        if retry < 1 and response.status >= 500:
-                            logger.info("Retrying due to server error...")
-                            await asyncio.sleep(3)
+                        logger.warning(f"Market Context response too short: {len(text)} chars")
+                        logger.warning(f"Response: {text}")
+                        # Retry if response is too short and we haven't retried yet
+                        if retry < 1 and len(text) < 50:
+                            logger.info("Retrying due to short response...")
+                            await asyncio.sleep(2)
                             return await PolymarketAPI.fetch_market_context(event_slug, market_question, retry + 1)
+                elif response.status == 400:
+                    logger.error(f"Bad Request (400) - Invalid event slug: {event_slug}")
+                    error_text = await response.text()
+                    logger.error(f"Error response: {error_text}")
+                else:
+                    logger.warning(f"Market Context API returned status: {response.status}")
+                    error_text = await response.text()
+                    logger.warning(f"Error response: {error_text}")
+                    # Retry on 5xx errors
+                    if retry < 1 and response.status >= 500:
+                        logger.info("Retrying due to server error...")
+                        await asyncio.sleep(3)
+                        return await PolymarketAPI.fetch_market_context(event_slug, market_question, retry + 1)
         except asyncio.TimeoutError:
             logger.error(f"Market Context request timed out after 120 seconds (attempt {retry + 1}/2)")
             # Retry once on timeout
@@ -249,6 +454,24 @@ class PolymarketAPI:
 
         return None
 
+    @staticmethod
+    async def read_market_context(response: aiohttp.ClientResponse) -> str:
+        """
+        Stream the Market Context body and stop at the __SOURCES__ block.
+        The sources are dropped anyway, so there's no need to wait for them.
+        """
+        marker = b'__SOURCES__'
+        body = bytearray()
+        async for chunk in response.content.iter_chunked(4096):
+            # Rescan only the tail where a marker split across chunks could start
+            start = max(0, len(body) - len(marker) + 1)
+            body += chunk
+            index = body.find(marker, start)
+            if index != -1:
+                # Remove sources block
+                return body[:index].decode('utf-8', errors='replace').strip()
+        return body.decode('utf-8', errors='replace')
+
     @staticmethod
     async def fetch_ai_analysis(event_slug: str, event_id: str = None) -> Optional[str]:
         """Fetch AI analysis from Polymarket Grok API (legacy method, now uses fetch_market_context)"""
@@ -259,59 +482,64 @@ class PolymarketAPI:
         url = f"{POLYMARKET_API}/events"
         params = {"slug": slug}
 
-        import ssl
-        ssl_context = ssl.create_default_context()
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
-
         try:
-            connector = aiohttp.TCPConnector(ssl=ssl_context)
-            async with aiohttp.ClientSession(connector=connector) as session:
-                async with session.get(url, params=params, timeout=15) as response:
-                    if response.status == 200:
-                        events = await response.json()
-                        if isinstance(events, list) and len(events) > 0:
-                            return events[0]
-                    else:
-                        logger.error(f"Failed to fetch event: {response.status}")
+            session = PolymarketAPI.get_session()
+            async with session.get(url, params=params, timeout=15) as response:
+                if response.status == 200:
+                    events = await response.json(loads=orjson.loads)
+                    if isinstance(events, list) and len(events) > 0:
+                        return events[0]
+                else:
+                    logger.error(f"Failed to fetch event: {response.status}")
         except Exception as e:
             logger.error(f"Error fetching event '{slug}': {e}")
 
         return None
 
     @staticmethod
-    async def fetch_recent_events(limit: int = 20) -> List[Dict]:
+    async def fetch_recent_events(limit: int = 20, offset: int = 0) -> List[Dict]:
         url = f"{POLYMARKET_API}/events"
         params = {
             "limit": limit,
-            "offset": 0,
+            "offset": offset,
             "closed": "false",
             "order": "new"
         }
 
-        import ssl
-        ssl_context = ssl.create_default_context()
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
-
         try:
-            connector = aiohttp.TCPConnector(ssl=ssl_context)
-            async with aiohttp.ClientSession(connector=connector) as session:
-                async with session.get(url, params=params, timeout=15) as response:
-                    if response.status == 200:
-                        events = await response.json()
-                        return events if isinstance(events, list) else []
-                    else:
-                        logger.error(f"Failed to fetch events: {response.status}")
+            session = PolymarketAPI.get_session()
+            async with session.get(url, params=params, timeout=15) as response:
+                if response.status == 200:
+                    # orjson caches map keys, so repeated keys share one string object across events
+                    events = await response.json(loads=orjson.loads)
+                    return events if isinstance(events, list) else []
+                else:
+                    logger.error(f"Failed to fetch events: {response.status}")
         except Exception as e:
             logger.error(f"Error fetching events: {e}")
 
         return []
+
+    @staticmethod
+    async def fetch_recent_events_paged(limit: int) -> List[Dict]:
+        """Fetch the newest `limit` events as concurrent pages instead of one large request"""
+        semaphore = asyncio.Semaphore(STARTUP_PAGE_CONCURRENCY)
+
+        async def fetch_page(offset: int) -> List[Dict]:
+            async with semaphore:
+                return await PolymarketAPI.fetch_recent_events(
+                    limit=min(STARTUP_PAGE_SIZE, limit - offset),
+                    offset=offset
+                )
+
+        pages = await asyncio.gather(*[
+            fetch_page(offset) for offset in range(0, limit, STARTUP_PAGE_SIZE)
+        ])
+        return [event for page in pages for event in page]
     
     @staticmethod
     def parse_polymarket_url(url: str) -> Optional[str]:
-        pattern = r'polymarket\.com/event/([a-zA-Z0-9\-]+)'
-        match = re.search(pattern, url)
+        match = EVENT_URL_PATTERN.search(url)
         if match:
             return match.group(1)
         return None
@@ -319,20 +547,31 @@ class PolymarketAPI:
     @staticmethod
     def format_money(value) -> str:
         try:
-            num = float(value) if value else 0
-            return f"${num:,.0f}"
+            num = float(value) if value else 0.0
         except:
             return "$0"
-    
+        # Normalized to float so "100", 100 and 100.0 share a cache entry
+        return PolymarketAPI._format_money_cached(num)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _format_money_cached(num: float) -> str:
+        return f"${num:,.0f}"
+
     @staticmethod
     def format_date(date_str: str) -> str:
         if not date_str:
             return "N/A"
         try:
-            dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-            return dt.strftime('%B %d, %Y at %H:%M UTC')
+            return PolymarketAPI._format_date_cached(date_str)
         except:
             return date_str
+
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _format_date_cached(date_str: str) -> str:
+        dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+        return dt.strftime('%B %d, %Y at %H:%M UTC')
     
     @staticmethod
     def calculate_totals(markets: List[Dict]) -> tuple:
@@ -353,6 +592,16 @@ class PolymarketAPI:
         
         return total_liquidity, total_volume
 
+    @staticmethod
+    def iter_outcome_odds(outcomes: List, prices: Optional[List]) -> Iterator[Tuple[int, str, float]]:
+        """Yield (index, name, percentage) for each outcome that has a price"""
+        if not prices:
+            return
+        for idx, outcome in enumerate(outcomes[:len(prices)]):
+            name = outcome.get('name', outcome) if isinstance(outcome, dict) else outcome
+            price = float(prices[idx])
+            yield idx, name, price * 100 if price <= 1 else price
+
     @staticmethod
     def format_event(event_data: Dict) -> str:
         try:
@@ -378,13 +627,14 @@ class PolymarketAPI:
             
             formatted_date = PolymarketAPI.format_date(end_date)
             
-            msg = []
-            msg.append(f"🔶 <b>{title}</b>\n")
-            msg.append(f"🔗 <b>Link:</b> https://polymarket.com/event/{slug}\n")
-            msg.append(f"🧡 <b>Market stats:</b>")
-            msg.append(f"<b>Closes:</b> {formatted_date}")
-            msg.append(f"<b>Total Liquidity:</b> {PolymarketAPI.format_money(total_liquidity)}")
-            msg.append(f"<b>Total Volume:</b> {PolymarketAPI.format_money(total_volume)}\n")
+            msg = [
+                f"🔶 <b>{title}</b>\n",
+                f"🔗 <b>Link:</b> https://polymarket.com/event/{slug}\n",
+                "🧡 <b>Market stats:</b>",
+                f"<b>Closes:</b> {formatted_date}",
+                f"<b>Total Liquidity:</b> {PolymarketAPI.format_money(total_liquidity)}",
+                f"<b>Total Volume:</b> {PolymarketAPI.format_money(total_volume)}\n",
+            ]
             
             if len(markets) == 1:
                 market = markets[0]
@@ -392,33 +642,24 @@ class PolymarketAPI:
                 
                 if outcomes and isinstance(outcomes, str):
                     try:
-                        outcomes = json.loads(outcomes)
+                        outcomes = orjson.loads(outcomes)
                     except:
                         outcomes = []
                 
                 outcome_prices = market.get('outcomePrices')
                 if isinstance(outcome_prices, str):
                     try:
-                        outcome_prices = json.loads(outcome_prices)
+                        outcome_prices = orjson.loads(outcome_prices)
                     except:
                         outcome_prices = []
                 
+                odds = PolymarketAPI.iter_outcome_odds(outcomes, outcome_prices)
                 if len(outcomes) == 2:
                     msg.append("📙 <b>Current Odds:</b>")
-                    for idx, outcome in enumerate(outcomes):
-                        name = outcome.get('name', outcome) if isinstance(outcome, dict) else outcome
-                        if outcome_prices and idx < len(outcome_prices):
-                            price = float(outcome_prices[idx])
-                            percentage = price * 100 if price <= 1 else price
-                            msg.append(f"  • {name}: {percentage:.1f}%")
+                    msg.extend(f"  • {name}: {percentage:.1f}%" for _, name, percentage in odds)
                 else:
                     msg.append("📙 <b>Options:</b>")
-                    for idx, outcome in enumerate(outcomes):
-                        name = outcome.get('name', outcome) if isinstance(outcome, dict) else outcome
-                        if outcome_prices and idx < len(outcome_prices):
-                            price = float(outcome_prices[idx])
-                            percentage = price * 100 if price <= 1 else price
-                            msg.append(f"  {idx + 1}. {name}: {percentage:.1f}%")
+                    msg.extend(f"  {idx + 1}. {name}: {percentage:.1f}%" for idx, name, percentage in odds)
             else:
                 # Filter markets with valid data
                 valid_markets = []
@@ -426,47 +667,30 @@ class PolymarketAPI:
                     market_outcomes = market.get('outcomes', [])
                     if isinstance(market_outcomes, str):
                         try:
-                            market_outcomes = json.loads(market_outcomes)
+                            market_outcomes = orjson.loads(market_outcomes)
                         except:
                             market_outcomes = []
                     
                     market_prices = market.get('outcomePrices')
                     if isinstance(market_prices, str):
                         try:
-                            market_prices = json.loads(market_prices)
+                            market_prices = orjson.loads(market_prices)
                         except:
                             market_prices = []
                     
                     # Only include markets with valid outcomes and prices
+                    # Keep the parsed lists so they aren't decoded again below
                     if market_outcomes and market_prices:
-                        valid_markets.append(market)
+                        valid_markets.append((market, market_outcomes, market_prices))
                 
                 msg.append(f"📙 <b>Markets ({len(valid_markets)}):</b>")
-                for idx, market in enumerate(valid_markets, 1):
+                for idx, (market, market_outcomes, market_prices) in enumerate(valid_markets, 1):
                     question = market.get('question', f'Market {idx}')
                     msg.append(f"  {idx}. {question}")
-                    
-                    market_outcomes = market.get('outcomes', [])
-                    if isinstance(market_outcomes, str):
-                        try:
-                            market_outcomes = json.loads(market_outcomes)
-                        except:
-                            market_outcomes = []
-                    
-                    market_prices = market.get('outcomePrices')
-                    if isinstance(market_prices, str):
-                        try:
-                            market_prices = json.loads(market_prices)
-                        except:
-                            market_prices = []
-                    
-                    if market_outcomes and market_prices:
-                        for o_idx, outcome in enumerate(market_outcomes[:5]):
-                            o_name = outcome.get('name', outcome) if isinstance(outcome, dict) else outcome
-                            if o_idx < len(market_prices):
-                                o_price = float(market_prices[o_idx])
-                                o_percentage = o_price * 100 if o_price <= 1 else o_price
-                                msg.append(f"     • {o_name}: {o_percentage:.1f}%")
+                    msg.extend(
+                        f"     • {o_name}: {o_percentage:.1f}%"
+                        for _, o_name, o_percentage in PolymarketAPI.iter_outcome_odds(market_outcomes[:5], market_prices)
+                    )
             
             return "\n".join(msg)
 
@@ -499,26 +723,114 @@ class PolymarketAPI:
 
         return basic_msg
 
+    @staticmethod
+    def build_notifications(entries: List[str]) -> List[str]:
+        """Pack formatted events into as few notifications as fit in MESSAGE_LIMIT"""
+        separator = "\n\n---\n\n"
+        budget = MESSAGE_LIMIT - len("<b>New Polymarket Events</b>\n\n")
+        batches = []
+        batch = []
+        size = 0
+        for entry in entries:
+            # Events are never cut in half, that would break their HTML tags
+            if batch and size + len(separator) + len(entry) > budget:
+                batches.append(batch)
+                batch = []
+                size = 0
+            size += len(entry) + (len(separator) if batch else 0)
+            batch.append(entry)
+        if batch:
+            batches.append(batch)
+
+        return [
+            f"<b>New Polymarket Event{'s' if len(batch) > 1 else ''}</b>\n\n{separator.join(batch)}"
+            for batch in batches
+        ]
+
+
+class KeepAliveSession(AiohttpSession):
+    """
+    aiogram session whose pooled connections survive the gap between notification bursts.
+    aiohttp's default 15s keep-alive would drop them before the next poll.
+    aiogram has no public option for this, so this is the one place that touches its connector kwargs.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        # Private aiogram attribute: fail at startup rather than silently lose the setting
+        if not isinstance(getattr(self, '_connector_init', None), dict):
+            raise RuntimeError("Unsupported aiogram version: AiohttpSession._connector_init not found")
+        self._connector_init['keepalive_timeout'] = KEEPALIVE_TIMEOUT
+
 
 class PolydictionsBot:
     
     def __init__(self, token: str):
+        # Every Telegram call shares this session's connection pool
         self.bot = Bot(
             token=token,
+            session=KeepAliveSession(json_loads=orjson.loads),
             default=DefaultBotProperties(parse_mode=ParseMode.HTML)
         )
         self.dp = Dispatcher()
         self.setup_handlers()
+        self.storage = StorageFlusher()
+        self._seen_log_lines = 0
+        self._interval = CHECK_INTERVAL
+        self._send_bucket = RateLimiter(SEND_RATE_LIMIT)
 
-        global subscribed_users, seen_events, user_keywords, paused_users
+        global subscribed_users, seen_events, user_keywords, compiled_keywords, paused_users, unfiltered_users, filtered_users
         subscribed_users = Storage.load_users()
         seen_events = Storage.load_seen_events()
         user_keywords = Storage.load_keywords()
+        compiled_keywords = {
+            user_id: PolymarketAPI.compile_keywords(keywords)
+            for user_id, keywords in user_keywords.items()
+        }
         paused_users = Storage.load_paused_users()
+        active_users = subscribed_users - paused_users
+        filtered_users = {user_id for user_id in active_users if compiled_keywords.get(user_id)}
+        unfiltered_users = active_users - filtered_users
+
+        # Fold a log left by the previous run into a fresh snapshot
+        if Path(SEEN_EVENTS_LOG).exists():
+            self.storage.mark('seen_events')
 
         logger.info(f"Loaded {len(subscribed_users)} users, {len(seen_events)} events, "
                    f"{len(user_keywords)} keyword filters, {len(paused_users)} paused users")
     
+    def record_seen_events(self, event_ids: List[str]):
+        """Append newly seen IDs to the log, compacting it once it outgrows the set"""
+        # Queued on the writer thread, so it can't interleave with a snapshot rewrite
+        self.storage.submit(Storage.append_seen_events, event_ids)
+        self._seen_log_lines += len(event_ids)
+        if self._seen_log_lines > 2 * len(seen_events):
+            self.storage.mark('seen_events')
+            self._seen_log_lines = 0
+
+    def update_audience(self, user_id: int):
+        """Keep unfiltered_users and filtered_users in sync after a subscription, pause or keywords change"""
+        unfiltered_users.discard(user_id)
+        filtered_users.discard(user_id)
+        if user_id in subscribed_users and user_id not in paused_users:
+            if compiled_keywords.get(user_id):
+                filtered_users.add(user_id)
+            else:
+                unfiltered_users.add(user_id)
+
+    def forget_user(self, user_id: int):
+        """Drop a user from every store so later fan-outs don't carry them"""
+        subscribed_users.discard(user_id)
+        paused_users.discard(user_id)
+        user_keywords.pop(user_id, None)
+        compiled_keywords.pop(user_id, None)
+        self.update_audience(user_id)
+
+        # Coalesced by the flusher, so a batch of removals rewrites each file once
+        self.storage.mark('users')
+        self.storage.mark('paused_users')
+        self.storage.mark('keywords')
+
     def setup_handlers(self):
         self.dp.message.register(self.cmd_start, Command("start"))
         self.dp.message.register(self.cmd_deal, Command("deal"))
@@ -530,7 +842,8 @@ class PolydictionsBot:
     async def cmd_start(self, message: Message):
         user_id = message.from_user.id
         subscribed_users.add(user_id)
-        Storage.save_users(subscribed_users)
+        self.update_audience(user_id)
+        self.storage.mark('users')
 
         text = (
             "🎯 <b>Welcome to Polydictions Bot</b>\n\n"
@@ -550,17 +863,16 @@ class PolydictionsBot:
         logger.info(f"User {user_id} subscribed")
     
     async def cmd_deal(self, message: Message):
-        text = message.text or ""
-        parts = text.split(maxsplit=1)
+        match = COMMAND_ARG_PATTERN.match(message.text or "")
 
-        if len(parts) < 2:
+        if not match:
             await message.answer(
                 "❌ Please provide a Polymarket link.\n\n"
                 "Example:\n/deal https://polymarket.com/event/your-event-slug"
             )
             return
 
-        url = parts[1].strip()
+        url = match.group(1)
         slug = PolymarketAPI.parse_polymarket_url(url)
 
         if not slug:
@@ -657,11 +969,10 @@ class PolydictionsBot:
 
     async def cmd_keywords(self, message: Message):
         user_id = message.from_user.id
-        text = message.text or ""
-        parts = text.split(maxsplit=1)
+        match = COMMAND_ARG_PATTERN.match(message.text or "")
 
         # Show current keywords and help
-        if len(parts) < 2:
+        if not match:
             current = user_keywords.get(user_id, [])
             if current:
                 keywords_text = ", ".join(current)
@@ -702,13 +1013,15 @@ class PolydictionsBot:
             return
 
         # Parse keywords
-        keyword_input = parts[1].strip()
+        keyword_input = match.group(1)
 
         # Clear keywords
         if keyword_input.lower() == "clear":
             if user_id in user_keywords:
                 del user_keywords[user_id]
-                Storage.save_keywords(user_keywords)
+                compiled_keywords.pop(user_id, None)
+                self.update_audience(user_id)
+                self.storage.mark('keywords')
                 await message.answer("✅ All keyword filters removed. You'll receive all events.")
             else:
                 await message.answer("You don't have any keyword filters set.")
@@ -724,7 +1037,9 @@ class PolydictionsBot:
 
         # Save keywords
         user_keywords[user_id] = keywords
-        Storage.save_keywords(user_keywords)
+        compiled_keywords[user_id] = PolymarketAPI.compile_keywords(keywords)
+        self.update_audience(user_id)
+        self.storage.mark('keywords')
 
         keywords_display = "\n".join([f"  • {k}" for k in keywords])
         await message.answer(
@@ -742,7 +1057,8 @@ class PolydictionsBot:
             return
 
         paused_users.add(user_id)
-        Storage.save_paused_users(paused_users)
+        self.update_audience(user_id)
+        self.storage.mark('paused_users')
 
         await message.answer(
             "⏸️ <b>Notifications paused</b>\n\n"
@@ -759,7 +1075,8 @@ class PolydictionsBot:
             return
 
         paused_users.remove(user_id)
-        Storage.save_paused_users(paused_users)
+        self.update_audience(user_id)
+        self.storage.mark('paused_users')
 
         keywords_info = ""
         if user_id in user_keywords:
@@ -771,112 +1088,237 @@ class PolydictionsBot:
         )
         logger.info(f"User {user_id} resumed notifications")
     
+    async def publish_notification(self, text: str) -> Optional[int]:
+        """Post a group's digest to LOG_CHAT_ID once and return its message ID for copying"""
+        if not LOG_CHAT_ID:
+            return None
+
+        for attempt in range(SEND_RETRIES + 1):
+            await self._send_bucket.acquire()
+            try:
+                message = await self.bot.send_message(LOG_CHAT_ID, text)
+                return message.message_id
+            except TelegramRetryAfter as e:
+                # Giving up here means one direct send per recipient, the worst path while flood-limited
+                if attempt == SEND_RETRIES:
+                    logger.error(f"Failed to post notification to log chat {LOG_CHAT_ID}: {e}")
+                    return None
+                logger.warning(f"Rate limited posting to log chat {LOG_CHAT_ID}, retrying in {e.retry_after}s")
+                await asyncio.sleep(e.retry_after)
+            except Exception as e:
+                logger.error(f"Failed to post notification to log chat {LOG_CHAT_ID}: {e}")
+                return None
+
+    async def send_notification(self, user_id: int, text: str, source_id: Optional[int] = None):
+        for attempt in range(SEND_RETRIES + 1):
+            await self._send_bucket.acquire()
+            try:
+                if source_id is not None:
+                    try:
+                        # Server-side copy of the log chat message, no need to upload the HTML again
+                        await self.bot.copy_message(user_id, LOG_CHAT_ID, source_id)
+                        return
+                    except TelegramRetryAfter:
+                        raise
+                    except Exception as e:
+                        # e.g. the log chat message was deleted or the bot lost access to the log chat.
+                        # Even a Forbidden here may be about the log chat, so the direct send decides.
+                        logger.warning(f"Failed to copy notification to {user_id}, sending it directly: {e}")
+                        source_id = None
+                        await self._send_bucket.acquire()
+                await self.bot.send_message(user_id, text)
+                return
+            except TelegramRetryAfter as e:
+                # Command replies bypass the bucket, so the bot-wide limit can still be hit
+                if attempt == SEND_RETRIES:
+                    logger.error(f"Failed to notify {user_id}: {e}")
+                    return
+                logger.warning(f"Rate limited notifying {user_id}, retrying in {e.retry_after}s")
+                await asyncio.sleep(e.retry_after)
+            except TelegramForbiddenError as e:
+                # Only raised by the direct send: the user blocked the bot or deleted the account
+                logger.info(f"Removing unreachable user {user_id}: {e}")
+                self.forget_user(user_id)
+                return
+            except Exception as e:
+                logger.error(f"Failed to notify {user_id}: {e}")
+                return
+
     async def check_new_events(self):
         global seen_events
         logger.info(f"Starting event monitoring with {len(seen_events)} seen events already loaded")
 
         if not seen_events:
             logger.info("Seen events is empty, initializing with recent 100 events...")
-            initial = await PolymarketAPI.fetch_recent_events(limit=100)
+            initial = await PolymarketAPI.fetch_recent_events_paged(limit=100)
             for event in initial:
                 event_id = event.get('id')
                 if event_id:
                     seen_events.add(str(event_id))
-            Storage.save_seen_events(seen_events)
+            self.storage.mark('seen_events')
             logger.info(f"Initialized with {len(seen_events)} events")
         else:
             logger.info(f"Using existing {len(seen_events)} seen events from storage")
             # Also fetch recent events and add any we might have missed
             logger.info("Refreshing with recent events to catch any gaps...")
-            initial = await PolymarketAPI.fetch_recent_events(limit=50)
-            added_count = 0
+            initial = await PolymarketAPI.fetch_recent_events_paged(limit=50)
+            added = []
+            seen_has = seen_events.__contains__
             for event in initial:
                 event_id = str(event.get('id', ''))
-                if event_id and event_id not in seen_events:
-                    volume = float(event.get('volume', 0) or 0)
-                    # Only add if volume > $10k (likely old event we missed)
-                    if volume > 10000:
-                        seen_events.add(event_id)
-                        added_count += 1
-                        logger.info(f"Added missed event to seen list: ID={event_id}, Volume=${volume:,.0f}")
-            if added_count > 0:
-                Storage.save_seen_events(seen_events)
-                logger.info(f"Added {added_count} previously missed events to seen list")
+                # Known IDs are the common case, skip them before parsing volume
+                if not event_id or seen_has(event_id):
+                    continue
+
+                volume = float(event.get('volume', 0) or 0)
+                # Only add if volume > $10k (likely old event we missed)
+                if volume > 10000:
+                    seen_events.add(event_id)
+                    added.append(event_id)
+                    logger.info("Added missed event to seen list: ID=%s, Volume=$%.0f", event_id, volume)
+            if added:
+                self.record_seen_events(added)
+                logger.info(f"Added {len(added)} previously missed events to seen list")
         
         while True:
             try:
-                await asyncio.sleep(CHECK_INTERVAL)
+                await asyncio.sleep(self._interval)
                 
-                recent = await PolymarketAPI.fetch_recent_events(limit=20)
+                # A slower poll must look further back, or a burst between polls would scroll past the page.
+                # One request, not concurrent pages: events inserted between page fetches would shift the
+                # page boundaries and slip through the gap.
+                poll_limit = math.ceil(POLL_LIMIT * max(1, self._interval / CHECK_INTERVAL))
+                recent = await PolymarketAPI.fetch_recent_events(limit=poll_limit)
                 new_events = []
+                newly_seen = []
                 filtered_count = 0
                 filtered_high_volume = 0
 
+                # Bind per-event lookups once for the loop
+                seen_has = seen_events.__contains__
+                mark_seen = seen_events.add
+                add_newly_seen = newly_seen.append
+                log_info = logger.info
                 for event in recent:
-                    event_id = str(event.get('id', ''))
-                    if event_id:
-                        if event_id not in seen_events:
-                            # Additional check: filter out events with high volume (likely old events)
-                            # If volume > $50k, it's probably been around for a while
-                            volume = float(event.get('volume', 0) or 0)
-
-                            if volume > 50000:
-                                # This is likely an old event with high volume, mark as seen but don't notify
-                                seen_events.add(event_id)
-                                filtered_high_volume += 1
-                                logger.info(f"Filtered high-volume event: ID={event_id}, Volume=${volume:,.0f}, Title={event.get('title', 'N/A')[:50]}")
-                            else:
-                                # This is a genuinely new event
-                                seen_events.add(event_id)
-                                new_events.append(event)
-                                logger.info(f"New event found: ID={event_id}, Volume=${volume:,.0f}, Title={event.get('title', 'N/A')[:50]}")
-                        else:
-                            filtered_count += 1
+                    event_id = str(event.get('id') or '')
+                    if not event_id:
+                        continue
+
+                    # Most polled events are already seen, count them before doing any other work
+                    if seen_has(event_id):
+                        filtered_count += 1
+                        continue
+
+                    # Additional check: filter out events with high volume (likely old events)
+                    # If volume > $50k, it's probably been around for a while
+                    volume_raw = event.get('volume')
+                    volume = float(volume_raw) if volume_raw else 0.0
+
+                    # Either way the event is seen from now on
+                    mark_seen(event_id)
+                    add_newly_seen(event_id)
+
+                    if volume > 50000:
+                        # This is likely an old event with high volume, don't notify
+                        filtered_high_volume += 1
+                        log_info("Filtered high-volume event: ID=%s, Volume=$%.0f, Title=%.50s",
+                                 event_id, volume, event.get('title', 'N/A'))
+                    else:
+                        # This is a genuinely new event
+                        new_events.append(event)
+                        log_info("New event found: ID=%s, Volume=$%.0f, Title=%.50s",
+                                 event_id, volume, event.get('title', 'N/A'))
+
+                logger.info("Checked %d events: %d new, %d already seen, %d filtered (high volume)",
+                            len(recent), len(new_events), filtered_count, filtered_high_volume)
+
+                # Adapt the polling interval to how busy the feed is
+                if new_events:
+                    self._interval = max(MIN_CHECK_INTERVAL, self._interval / 2)
+                elif recent and filtered_count == len(recent):
+                    self._interval = min(MAX_CHECK_INTERVAL, self._interval * 2)
 
-                logger.info(f"Checked {len(recent)} events: {len(new_events)} new, {filtered_count} already seen, {filtered_high_volume} filtered (high volume)")
+                if newly_seen:
+                    self.record_seen_events(newly_seen)
 
                 if new_events:
-                    Storage.save_seen_events(seen_events)
                     logger.info(f"Found {len(new_events)} new events")
 
                     if subscribed_users:
-                        for event in new_events:
-                            formatted = PolymarketAPI.format_event(event)
-                            notification = f"<b>New Polymarket Event</b>\n\n{formatted}"
-
-                            for user_id in list(subscribed_users):
-                                try:
-                                    # Skip if user is paused
-                                    if user_id in paused_users:
-                                        continue
-
-                                    # Check keyword filters
-                                    user_filter = user_keywords.get(user_id, [])
-                                    if user_filter and not PolymarketAPI.matches_keywords(event, user_filter):
-                                        # Event doesn't match user's keywords, skip
-                                        continue
-
-                                    # Send notification
-                                    await self.bot.send_message(user_id, notification)
-                                    await asyncio.sleep(0.5)
-                                except Exception as e:
-                                    logger.error(f"Failed to notify {user_id}: {e}")
+                        # Snapshot the audience once per tick rather than once per event
+                        unfiltered = tuple(unfiltered_users)
+                        filtered = tuple((user_id, compiled_keywords[user_id]) for user_id in filtered_users)
+
+                        # Group users by the exact events they get, so each group shares its messages
+                        audiences = {}
+                        if unfiltered:
+                            # Users without filters get every event, no matching needed
+                            audiences[tuple(range(len(new_events)))] = list(unfiltered)
+                        if filtered:
+                            searchables = [PolymarketAPI.build_searchable(event) for event in new_events]
+                            # Users with identical keywords share an automaton, so match each one once
+                            matched_by_filter = {}
+                            for user_id, user_filter in filtered:
+                                # Check keyword filters
+                                matched = matched_by_filter.get(user_filter)
+                                if matched is None:
+                                    matched = matched_by_filter[user_filter] = tuple(
+                                        index for index, searchable in enumerate(searchables)
+                                        if PolymarketAPI.matches_keywords(searchable, user_filter)
+                                    )
+                                if matched:
+                                    audiences.setdefault(matched, []).append(user_id)
+
+                        # Each event is formatted once, however many groups it ends up in
+                        formatted = {}
+                        for indices, recipients in audiences.items():
+                            entries = []
+                            for index in indices:
+                                if index not in formatted:
+                                    formatted[index] = PolymarketAPI.format_event(new_events[index])
+                                entries.append(formatted[index])
+
+                            # One message per user for the whole tick, unless it has to be split
+                            for notification in PolymarketAPI.build_notifications(entries):
+                                # A lone recipient is cheaper to message directly than to publish and copy.
+                                # Otherwise falls back to direct sends when no log chat is configured or posting failed.
+                                source_id = await self.publish_notification(notification) if len(recipients) > 1 else None
+
+                                # Send notifications concurrently, paced by the shared rate limiter
+                                await asyncio.gather(
+                                    *[self.send_notification(user_id, notification, source_id) for user_id in recipients],
+                                    return_exceptions=True
+                                )
             
             except Exception as e:
                 logger.error(f"Error in monitoring: {e}")
     
     async def start(self):
-        asyncio.create_task(self.check_new_events())
+        tasks = [
+            asyncio.create_task(self.check_new_events()),
+            asyncio.create_task(self.storage.run()),
+        ]
         
         logger.info("Bot started")
-        await self.dp.start_polling(self.bot, allowed_updates=["message"])
+        try:
+            await self.dp.start_polling(self.bot, allowed_updates=["message"])
+        finally:
+            # Stop anything that could still submit writes before the writer shuts down
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self.storage.close()
+            await PolymarketAPI.close_session()
 
 
 async def main():
+    if sys.version_info >= (3, 12):
+        # Start tasks eagerly so short-lived ones finish without a scheduler round-trip
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+
     token = None
     
     try:
-        import sys
         sys.path.insert(0, str(Path(__file__).parent))
         from config import BOT_TOKEN
         token = BOT_TOKEN
@@ -904,6 +1346,11 @@ async def main():
 
 if __name__ == '__main__':
     try:
-        asyncio.run(main())
+        if sys.platform != 'win32':
+            # libuv-based event loop, faster for the socket-heavy bot workload
+            import uvloop
+            uvloop.run(main())
+        else:
+            asyncio.run(main())
     except KeyboardInterrupt:
         logger.info("Bot stopped")